@@ -1,7 +1,132 @@
-from typing import Literal
-from openai import OpenAI
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import AsyncIterator, Iterator, Literal
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, APITimeoutError, InternalServerError, OpenAIError, RateLimitError
 from dotenv import load_dotenv
+from tenacity import AsyncRetrying, Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+from _http import SHARED_HTTPX, SHARED_ASYNC_HTTPX
+from RateLimiter import estimate_tokens, rate_limiter
+from SemanticCache import EMBEDDING_MODEL, SemanticCache
+import asyncio
+import atexit
+import io
+import json
 import os
+import shelve
+import time
+
+# Load the OpenAI API key once per process rather than on every Agent creation
+load_dotenv()
+_API_KEY = os.getenv("OPENAI_API_KEY")
+if not _API_KEY:
+    raise ValueError("OPENAI_API_KEY is not set. Add it to your environment variables or .env file.")
+
+# In-memory LRU cache of response texts shared by all agents, keyed by a hash
+# of the model and the full message list sent to the API
+_CACHE: OrderedDict[str, str] = OrderedDict()
+_CACHE_SIZE = 512
+
+# On-disk cache under the in-memory one for agents created with disk_cache=True,
+# so repeated runs skip identical requests (e.g. the opening topic lists)
+_DISK_CACHE_PATH = os.path.expanduser("~/.cache/debatingagents/ask.db")
+_DISK_CACHE = None
+
+# Requests currently awaited by aask(), keyed like _CACHE, so that concurrent
+# identical requests share one API call instead of each paying for their own
+_INFLIGHT: dict[str, asyncio.Task] = {}
+
+def _disk_cache():
+    """Open the on-disk cache on first use, closing it again at interpreter exit."""
+    global _DISK_CACHE
+    if _DISK_CACHE is None:
+        os.makedirs(os.path.dirname(_DISK_CACHE_PATH), exist_ok=True)
+        _DISK_CACHE = shelve.open(_DISK_CACHE_PATH)
+        atexit.register(_DISK_CACHE.close)
+    return _DISK_CACHE
+
+def _cache_get(key, disk=False):
+    """Return a cached response text and mark it as recently used, or None on a miss."""
+    if key is None:
+        return None
+    if key not in _CACHE:
+        text = _disk_cache().get(key) if disk else None
+        if text is not None:
+            _cache_put(key, text)
+        return text
+    _CACHE.move_to_end(key)
+    return _CACHE[key]
+
+def _cache_put(key, text, disk=False):
+    """Store a response text, evicting the least recently used entry when full."""
+    if key is None:
+        return
+    _CACHE[key] = text
+    _CACHE.move_to_end(key)
+    if len(_CACHE) > _CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    if disk:
+        _disk_cache()[key] = text
+
+# Transient API failures worth retrying: rate limits, timeouts, dropped
+# connections and 5xx server errors
+_RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+_MAX_RETRY_WAIT = 30
+_backoff = wait_exponential(multiplier=1, max=_MAX_RETRY_WAIT)
+
+def _wait_retry_after(retry_state):
+    """Wait as long as the server's Retry-After header asks, up to 30 s, else back off exponentially."""
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    if response is not None:
+        try:
+            return min(float(response.headers.get("retry-after")), _MAX_RETRY_WAIT)
+        except (TypeError, ValueError):
+            pass
+    return _backoff(retry_state)
+
+_RETRY_POLICY = {
+    "wait": _wait_retry_after,
+    "stop": stop_after_attempt(5),
+    "retry": retry_if_exception_type(_RETRYABLE_ERRORS),
+    "reraise": True
+}
+
+# Upper bound on chat requests awaited at once by concurrent aask() calls
+_ASYNC_SLOTS = asyncio.Semaphore(8)
+
+def _call_with_retries(create, **kwargs):
+    """Call an OpenAI API method, retrying transient failures with backoff."""
+    for attempt in Retrying(**_RETRY_POLICY):
+        with attempt:
+            return create(**kwargs)
+
+async def _acall_with_retries(create, **kwargs):
+    """Await an async OpenAI API method, retrying transient failures with backoff."""
+    async for attempt in AsyncRetrying(**_RETRY_POLICY):
+        with attempt:
+            return await create(**kwargs)
+
+# Number of most recent transcript turns compared by the semantic cache
+_SEMANTIC_CONTEXT_TURNS = 4
+
+# OpenAI only caches prompts at least this many tokens long
+_PROMPT_CACHE_MIN_TOKENS = 1024
+
+# Reasoning models count hidden reasoning tokens against the completion budget
+# and reject stop sequences, so output caps are only applied to other models
+_REASONING_MODEL_PREFIXES = ("gpt-5", "o1", "o3", "o4")
+
+def _request_hash(model, messages):
+    """Return a compact hex digest identifying a model and message list."""
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True)
+    return blake2b(payload.encode(), digest_size=16).hexdigest()
+
+def _response_record(response_id, usage, finish_reason):
+    """Return the compact record of an API response kept in Agent.responses."""
+    return {
+        "id": response_id,
+        "usage": usage.model_dump() if usage is not None else None,
+        "finish_reason": finish_reason
+    }
 
 class Agent:
     """
@@ -17,10 +142,26 @@ class Agent:
         persona (str): Character description that defines the agent's personality and behavior.
         topic (str): The subject matter for discussions.
         model (str): OpenAI model identifier (default: 'gpt-5-mini').
-        messages (list): Conversation history including system prompts and context.
-        responses (list): Collection of API responses for tracking and analysis.
-        api_key (str): OpenAI API authentication key loaded from environment.
-        client (OpenAI): Configured OpenAI client instance.
+        temperature (float): Sampling temperature, or None for the model default.
+        max_tokens (int): Cap on generated tokens per response, or None for no cap.
+        stop (list): Sequences that end a response early, or None.
+        semantic_cache (SemanticCache): Cache of responses to similar prompts, or
+                        None when semantic caching is disabled.
+        disk_cache (bool): Whether exact-match cached responses persist across runs.
+        messages (list): Conversation history, starting with the single system prompt.
+        prompt_cache_key (str): Hash of the model and system prompt, sent with every
+                               request so OpenAI routes calls sharing that prefix,
+                               in this and later debates, to the same prompt cache.
+        responses (list): Compact record of each API response (id, usage and
+                         finish reason) for tracking and analysis. With
+                         keep_full_responses, the full response objects (or
+                         the list of chunks for streamed calls) are kept instead.
+        api_key (str): OpenAI API authentication key loaded from environment at import.
+        client (OpenAI): Configured OpenAI client instance. Unless a custom
+                        http_client is given, it sends requests through the
+                        connection pool shared by every agent.
+        aclient (AsyncOpenAI): Async OpenAI client used by aask(), backed by the
+                        shared async connection pool.
     
     Example:
         >>> agent = Agent(
@@ -30,12 +171,21 @@ class Agent:
         ... )
         >>> response = agent.ask("", "What's your initial position?")
     """
-    def __init__(self, name, persona, topic, model='gpt-5-mini'):
+    # Fixed attribute layout: no per-instance __dict__, faster attribute access
+    __slots__ = (
+        "name", "persona", "topic", "model", "temperature", "max_tokens", "stop",
+        "semantic_cache", "disk_cache", "messages", "prompt_cache_key",
+        "keep_full_responses", "responses", "api_key", "_owns_http_client",
+        "client", "aclient", "side"
+    )
+
+    def __init__(self, name, persona, topic, model='gpt-5-mini', http_client=None, temperature=None, semantic_cache=False,
+                 disk_cache=False, keep_full_responses=False):
         """
         Initialize a new Agent instance with personality and conversation setup.
         
         Sets up the agent's identity, loads API credentials, and configures the
-        initial conversation context with system prompts that define the agent's
+        initial conversation context with a system prompt that defines the agent's
         behavior and constraints.
         
         Args:
@@ -45,36 +195,79 @@ class Agent:
             topic (str): The subject matter or theme for discussions.
             model (str, optional): OpenAI model identifier. Defaults to 'gpt-5-mini'.
                                  Common options include 'gpt-4', 'gpt-3.5-turbo'.
+            http_client (httpx.Client, optional): HTTP client to send requests
+                                 through. Defaults to None, which uses the
+                                 connection pool shared by all agents.
+            temperature (float, optional): Sampling temperature sent with each
+                                 request. Defaults to None, which uses the
+                                 model's default. Only None or 0 responses are
+                                 cached.
+            semantic_cache (bool | str, optional): Whether to reuse responses
+                                 for prompts that are paraphrases of earlier
+                                 ones, at the cost of one embedding request per
+                                 uncached call. A path to a SQLite file also
+                                 persists the cache there, so that it is reused
+                                 by later debates with the same persona and
+                                 topic. Defaults to False.
+            disk_cache (bool, optional): Whether exact-match cached responses are
+                                 also kept on disk in ~/.cache/debatingagents,
+                                 so identical requests in later runs are not
+                                 sent again. Defaults to False.
+            keep_full_responses (bool, optional): Whether to retain the complete
+                                 response objects in self.responses instead of
+                                 a compact summary. Defaults to False.
         
         Raises:
-            ValueError: If OpenAI API key is not found in environment variables.
             OpenAIError: If there's an issue initializing the OpenAI client.
         
         Note:
             Requires OPENAI_API_KEY to be set in environment variables or .env file.
+            The key is read once when this module is imported, which raises
+            ValueError if it is missing.
+            Setting OPENAI_BASE_URL points every agent at an OpenAI-compatible
+            server instead, such as a local Ollama or vLLM instance serving an
+            int8/fp8-quantized model, with model set to that server's model name.
+            Quantization and KV cache settings are configured on that server.
         """
         self.name = name
         self.persona = persona
         self.topic = topic
         self.model = model
+        self.temperature = temperature
+        self.max_tokens = None
+        self.stop = None
+        self.disk_cache = disk_cache
+        self.semantic_cache = None
+        if semantic_cache:
+            self.semantic_cache = SemanticCache(
+                path=semantic_cache if isinstance(semantic_cache, str) else None,
+                namespace=f"{self.model}|{self.name}|{self.persona}|{self.topic}"
+            )
         
-        # Initialize the system messages that define the agent's behavior
+        # Initialize the system message that defines the agent's behavior. It is
+        # kept to a single message since it is resent with every request.
         self.messages = [
-            {"role": "system", "content": f"Your name is {self.name}. You are {self.persona}."},
-            {"role": "system", "content": "Your responses should mimic real human conversation.  No headings or bullet points, just natural flowing text that aligns with your persona."},
-            {"role": "system", "content": f"The topic of discussion is: {self.topic}."},
-            {"role": "system", "content": f"Try not to repeat yourself or use similar phrases over and over again. Keep it fresh and engaging."}
+            {"role": "system", "content": (
+                f"Your name is {self.name}. You are {self.persona}. "
+                f"The topic of discussion is: {self.topic}. "
+                "Respond like natural human conversation that fits your persona, with no headings or bullet points, "
+                "and avoid repeating yourself or reusing the same phrases."
+            )}
         ]
+        self.prompt_cache_key = _request_hash(self.model, self.messages)
         
-        # Store all API responses for potential future analysis
+        # Store a record of every API response for potential future analysis
+        self.keep_full_responses = keep_full_responses
         self.responses = []
         
-        # Load OpenAI API key from environment variables
-        load_dotenv()
-        self.api_key = os.getenv("OPENAI_API_KEY")
-        self.client = OpenAI(api_key=self.api_key)
+        # Use the OpenAI API key loaded from the environment at import time
+        self.api_key = _API_KEY
+        self._owns_http_client = http_client is not None
+        # Retries are handled by _RETRY_POLICY, so the SDK's own retries are disabled
+        self.client = OpenAI(api_key=self.api_key, http_client=http_client or SHARED_HTTPX, max_retries=0)
+        self.aclient = AsyncOpenAI(api_key=self.api_key, http_client=SHARED_ASYNC_HTTPX, max_retries=0)
         
-    def ask(self, related_text: str, meta_prompt: str, indent_paragraphs=True) -> str:
+    def ask(self, related_text: str, meta_prompt: str) -> str:
         """
         Generate an AI response based on conversation context and user prompt.
         
@@ -88,41 +281,699 @@ class Agent:
                                string for initial interactions.
             meta_prompt (str): The specific question, request, or instruction that
                               the agent should respond to.
-            indent_paragraphs (bool, optional): Whether to indent paragraph breaks
-                                              with tabs for formatted output.
-                                              Defaults to True.
         
         Returns:
-            str: The agent's generated response text. If indent_paragraphs is True,
-                 newlines are replaced with newline + tab for indented formatting.
+            str: The agent's generated response text, unformatted. Paragraph
+                 indentation is applied by Transcript when the text is rendered.
         
         Raises:
-            OpenAIError: If the API request fails due to authentication, rate limits,
-                        or service availability issues.
+            OpenAIError: If the API request fails due to authentication, or if rate
+                        limits or service availability issues persist after
+                        retrying with exponential backoff.
             ValueError: If the model parameter is invalid or unsupported.
         
         Note:
             Each API call is stored in self.responses for potential analysis or
             debugging. The conversation context (self.messages) is preserved
             across calls but not permanently updated with new exchanges.
+            The response is collected from ask_stream(), so use that method
+            directly to display text as it is generated. Identical requests
+            with a deterministic temperature (None or 0) are answered from an
+            in-memory cache shared by all agents without calling the API, and
+            with disk_cache enabled from an on-disk cache kept between runs.
+            With semantic_cache enabled, a sufficiently similar earlier prompt
+            is answered from the agent's semantic cache as well.
         """
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=self.messages + [
-                {"role": "assistant", "content": related_text},
-                {"role": "user", "content": meta_prompt}
-            ]
+        return "".join(self.ask_stream(related_text, meta_prompt))
+
+    def ask_stream(self, related_text: str, meta_prompt: str) -> Iterator[str]:
+        """
+        Stream an AI response piece by piece as the model generates it.
+        
+        Sends the same request as ask() with streaming enabled and yields each
+        text delta as soon as it arrives, so callers can display or write the
+        response without waiting for the whole completion.
+        
+        Args:
+            related_text (str): Previous conversation context or related information
+                               that provides background for the response. Can be empty
+                               string for initial interactions.
+            meta_prompt (str): The specific question, request, or instruction that
+                              the agent should respond to.
+        
+        Yields:
+            str: Consecutive pieces of the agent's response text.
+        
+        Raises:
+            OpenAIError: If the API request fails due to authentication, or if rate
+                        limits or service availability issues persist after
+                        retrying with exponential backoff.
+        
+        Note:
+            Uses the same caches as ask(): a response from the exact-match or
+            semantic cache is yielded as a single piece, and a fully consumed
+            stream is added to both.
+        
+        Example:
+            >>> for text in agent.ask_stream("", "What's your initial position?"):
+            ...     print(text, end="", flush=True)
+        """
+        request = self._request_kwargs(related_text, meta_prompt)
+        key = self._cache_key(request)
+        text = _cache_get(key, self.disk_cache)
+        
+        embedding = None
+        if text is None and self.semantic_cache is not None:
+            embedding = _call_with_retries(
+                self.client.embeddings.create,
+                model=EMBEDDING_MODEL,
+                input=self._semantic_query(related_text, meta_prompt)
+            ).data[0].embedding
+            text = self.semantic_cache.lookup(embedding)
+        
+        if text is not None:
+            yield text
+            return
+        
+        pieces = []
+        for piece in self._stream(request):
+            pieces.append(piece)
+            yield piece
+        text = "".join(pieces)
+        _cache_put(key, text, self.disk_cache)
+        if embedding is not None:
+            self.semantic_cache.add(embedding, text)
+
+    def _stream(self, request: dict) -> Iterator[str]:
+        """
+        Send a prepared request with streaming enabled and yield its text deltas.
+        
+        Args:
+            request (dict): Keyword arguments built by _request_kwargs().
+        
+        Yields:
+            str: Consecutive pieces of the response text.
+        """
+        stream = self._create(request, stream=True, stream_options={"include_usage": True})
+        
+        chunks = []
+        response_id = usage = finish_reason = None
+        for chunk in stream:
+            if self.keep_full_responses:
+                chunks.append(chunk)
+            response_id = chunk.id
+            usage = chunk.usage or usage
+            
+            # The final usage chunk carries no choices
+            if not chunk.choices:
+                continue
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            if chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+        
+        # Store the streamed response for potential analysis
+        if self.keep_full_responses:
+            self.responses.append(chunks)
+        else:
+            self.responses.append(_response_record(response_id, usage, finish_reason))
+
+    async def astream(self, related_text: str, meta_prompt: str) -> AsyncIterator[str]:
+        """
+        Async counterpart of ask_stream(), yielding text as the model generates it.
+        
+        Lets an event loop display a response as it arrives instead of waiting
+        for the whole completion, so the reader only waits for the first token.
+        
+        Args:
+            related_text (str): Previous conversation context or related information
+                               that provides background for the response. Can be empty
+                               string for initial interactions.
+            meta_prompt (str): The specific question, request, or instruction that
+                              the agent should respond to.
+        
+        Yields:
+            str: Consecutive pieces of the agent's response text.
+        
+        Raises:
+            OpenAIError: If the API request fails due to authentication, or if rate
+                        limits or service availability issues persist after
+                        retrying with exponential backoff.
+        
+        Note:
+            Takes the same path as aask(): a response from the exact-match or
+            semantic cache, or from an identical request already in flight, is
+            yielded as a single piece. Otherwise the response is streamed by a
+            background task that concurrent identical requests await, and that
+            still completes and caches it if this caller stops reading early.
+        
+        Example:
+            >>> async for text in agent.astream("", "What's your initial position?"):
+            ...     print(text, end="", flush=True)
+        """
+        request = self._request_kwargs(related_text, meta_prompt)
+        key = self._cache_key(request)
+        text = _cache_get(key, self.disk_cache)
+        if text is None:
+            task = _INFLIGHT.get(key) if key is not None else None
+            if task is None:
+                # This call sends the request, so relay its pieces as they arrive
+                pieces = asyncio.Queue()
+                task = self._start_fetch(related_text, meta_prompt, request, key, pieces)
+                try:
+                    while True:
+                        piece = await pieces.get()
+                        if piece is None:
+                            break
+                        yield piece
+                    # Re-raises the error of a failed request
+                    await task
+                finally:
+                    # Nobody else can be handed an uncacheable response
+                    if key is None:
+                        task.cancel()
+                return
+            
+            # Shielded so a cancelled caller does not cancel the call for the others
+            text = await asyncio.shield(task)
+        yield text
+
+    async def _astream(self, request: dict) -> AsyncIterator[str]:
+        """
+        Async counterpart of _stream().
+        
+        Args:
+            request (dict): Keyword arguments built by _request_kwargs().
+        
+        Yields:
+            str: Consecutive pieces of the response text.
+        """
+        stream = await self._acreate(request, stream=True, stream_options={"include_usage": True})
+        
+        chunks = []
+        response_id = usage = finish_reason = None
+        async for chunk in stream:
+            if self.keep_full_responses:
+                chunks.append(chunk)
+            response_id = chunk.id
+            usage = chunk.usage or usage
+            
+            # The final usage chunk carries no choices
+            if not chunk.choices:
+                continue
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            if chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+        
+        # Store the streamed response for potential analysis
+        if self.keep_full_responses:
+            self.responses.append(chunks)
+        else:
+            self.responses.append(_response_record(response_id, usage, finish_reason))
+
+    async def aask(self, related_text: str, meta_prompt: str) -> str:
+        """
+        Asynchronously generate an AI response, mirroring ask().
+
+        Awaits the OpenAI API through the async client so that independent agent
+        calls (for example both debaters preparing their opening topics) can be
+        issued together with asyncio.gather() instead of one after another.
+
+        Args:
+            related_text (str): Previous conversation context or related information
+                               that provides background for the response. Can be empty
+                               string for initial interactions.
+            meta_prompt (str): The specific question, request, or instruction that
+                              the agent should respond to.
+
+        Returns:
+            str: The agent's generated response text, as returned by ask().
+
+        Raises:
+            OpenAIError: If the API request fails due to authentication, or if rate
+                        limits or service availability issues persist after
+                        retrying with exponential backoff.
+
+        Example:
+            >>> pro_text, con_text = await asyncio.gather(
+            ...     pro.aask("", "What's your opening argument?"),
+            ...     con.aask("", "What's your opening argument?")
+            ... )
+
+        Note:
+            Concurrent calls that would send an identical cacheable request
+            await the same in-flight API call rather than issuing duplicates.
+        """
+        request = self._request_kwargs(related_text, meta_prompt)
+        key = self._cache_key(request)
+        text = _cache_get(key, self.disk_cache)
+        if text is not None:
+            return text
+        if key is None:
+            return await self._afetch(related_text, meta_prompt, request, key)
+        
+        task = _INFLIGHT.get(key)
+        if task is None:
+            task = self._start_fetch(related_text, meta_prompt, request, key)
+        
+        # Shielded so a cancelled caller does not cancel the call for the others
+        return await asyncio.shield(task)
+
+    def _start_fetch(self, related_text: str, meta_prompt: str, request: dict, key, pieces=None) -> asyncio.Task:
+        """
+        Run _afetch() as a task, registered in _INFLIGHT when the request is cacheable.
+        
+        Args:
+            related_text (str): Conversation context sent as the assistant message.
+            meta_prompt (str): The instruction sent as the user message.
+            request (dict): Keyword arguments built by _request_kwargs().
+            key (str | None): The request's cache key from _cache_key().
+            pieces (asyncio.Queue, optional): Queue passed on to _afetch().
+        
+        Returns:
+            asyncio.Task: The task, whose result is the response text.
+        """
+        task = asyncio.ensure_future(self._afetch(related_text, meta_prompt, request, key, pieces))
+        if key is not None:
+            _INFLIGHT[key] = task
+            task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+        return task
+
+    async def _afetch(self, related_text: str, meta_prompt: str, request: dict, key, pieces=None) -> str:
+        """
+        Answer an aask() or astream() request that missed the exact-match cache.
+        
+        Args:
+            related_text (str): Conversation context sent as the assistant message.
+            meta_prompt (str): The instruction sent as the user message.
+            request (dict): Keyword arguments built by _request_kwargs().
+            key (str | None): The request's cache key from _cache_key().
+            pieces (asyncio.Queue, optional): Queue that receives the response
+                                  text as it is streamed, followed by None once
+                                  it ends. Defaults to None, which requests the
+                                  response without streaming.
+        
+        Returns:
+            str: The response text, from the semantic cache or the API.
+        """
+        try:
+            text = None
+            embedding = None
+            if self.semantic_cache is not None:
+                embedding = (await _acall_with_retries(
+                    self.aclient.embeddings.create,
+                    model=EMBEDDING_MODEL,
+                    input=self._semantic_query(related_text, meta_prompt)
+                )).data[0].embedding
+                text = self.semantic_cache.lookup(embedding)
+            
+            if text is None:
+                if pieces is None:
+                    response = await self._acreate(request)
+                    
+                    # Store the response for potential analysis
+                    self._record_response(response)
+                    text = response.choices[0].message.content
+                else:
+                    parts = []
+                    async for piece in self._astream(request):
+                        parts.append(piece)
+                        pieces.put_nowait(piece)
+                    text = "".join(parts)
+                _cache_put(key, text, self.disk_cache)
+                if embedding is not None:
+                    self.semantic_cache.add(embedding, text)
+            elif pieces is not None:
+                pieces.put_nowait(text)
+            
+            return text
+        finally:
+            if pieces is not None:
+                pieces.put_nowait(None)
+
+    async def awarm(self, related_text: str):
+        """
+        Prefill OpenAI's prompt cache with the agent's next context.
+        
+        Sends the system prompt and context with a one-token completion limit,
+        so that a real request sent shortly afterwards with the same prefix is
+        served from the provider's prompt cache. Meant to run while waiting on
+        something slow, such as the user typing the next moderator prompt.
+        
+        Args:
+            related_text (str): The conversation context the next request will start with.
+        
+        Note:
+            Nothing is sent for contexts too short for OpenAI to cache. Errors are
+            ignored, since a failed warm-up only means the real request is uncached.
+            The response is not recorded in self.responses.
+        
+        Example:
+            >>> warm = asyncio.ensure_future(pro.awarm(context))
+            >>> moderation = await asyncio.to_thread(input, "> ")
+        """
+        request = self._request_kwargs(related_text, "")
+        if estimate_tokens(request["model"], request["messages"]) < _PROMPT_CACHE_MIN_TOKENS:
+            return
+        
+        request.pop("stop", None)
+        request["max_completion_tokens"] = 1
+        try:
+            await self._acreate(request)
+        except OpenAIError:
+            pass
+
+    def ask_many(self, prompts: list[str], related_text: str = "") -> list[str]:
+        """
+        Answer several independent prompts with a single API request.
+        
+        Combines the prompts into one numbered user message and asks the model
+        for a JSON object holding one answer per prompt, which is then split
+        client-side. This saves a full network round trip for every additional
+        prompt compared to calling ask() once per prompt.
+        
+        Args:
+            prompts (list[str]): The independent questions or instructions to answer.
+            related_text (str, optional): Conversation context shared by all of the
+                                         prompts. Defaults to an empty string.
+        
+        Returns:
+            list[str]: One response text per prompt, in the same order.
+        
+        Raises:
+            OpenAIError: If the API request fails due to authentication, or if rate
+                        limits or service availability issues persist after
+                        retrying with exponential backoff.
+            ValueError: If the reply is not a JSON object whose "answers" list
+                       holds exactly one answer per prompt.
+        
+        Example:
+            >>> intro, question = moderator.ask_many([
+            ...     "Introduce tonight's debate.",
+            ...     "Ask both debaters an opening question."
+            ... ])
+        """
+        numbered = "\n".join(f"{i}) {prompt}" for i, prompt in enumerate(prompts, 1))
+        meta_prompt = (
+            "Answer each of the following separately. Respond with a JSON object of the form "
+            '{"answers": [...]} containing exactly one string per item, in order:\n' + numbered
         )
         
+        # The single reply holds every answer, so the per-turn output cap and
+        # stop sequences would cut the JSON short
+        request = self._request_kwargs(related_text, meta_prompt)
+        request.pop("max_completion_tokens", None)
+        request.pop("stop", None)
+        response = self._create(request, response_format={"type": "json_object"})
+        
         # Store the response for potential analysis
-        self.responses.append(response)
+        self._record_response(response)
+        
+        try:
+            answers = json.loads(response.choices[0].message.content)["answers"]
+        except (KeyError, TypeError) as exc:
+            raise ValueError("The model did not return a JSON object with an 'answers' list") from exc
+        if not isinstance(answers, list):
+            raise ValueError("The model did not return a JSON object with an 'answers' list")
+        if len(answers) != len(prompts):
+            raise ValueError(f"Expected {len(prompts)} answers but the model returned {len(answers)}")
+        return answers
+
+    def batch_call(self, custom_id: str, related_text: str, meta_prompt: str) -> dict:
+        """
+        Build one Batch API request line for this agent.
+        
+        Args:
+            custom_id (str): Identifier used to match the result to this request.
+            related_text (str): Conversation context sent as the assistant message.
+            meta_prompt (str): The instruction sent as the user message.
+        
+        Returns:
+            dict: A request in the Batch API JSONL format, ready for submit_batch().
+        """
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": self._request_kwargs(related_text, meta_prompt)
+        }
+
+    def submit_batch(self, calls: list[dict]) -> str:
+        """
+        Submit chat completion requests through the OpenAI Batch API.
+        
+        Batch requests cost half as much as synchronous calls but complete
+        within a 24 hour window, which suits unattended debate runs where cost
+        matters more than latency. The calls may come from several agents.
+        
+        Args:
+            calls (list[dict]): Request lines built with batch_call().
+        
+        Returns:
+            str: The batch ID to pass to collect_batch().
+        
+        Raises:
+            OpenAIError: If uploading the input file or creating the batch fails.
+        
+        Example:
+            >>> batch_id = pro.submit_batch([
+            ...     pro.batch_call("pro", "", "What's your opening argument?"),
+            ...     con.batch_call("con", "", "What's your opening argument?")
+            ... ])
+        """
+        lines = "".join(json.dumps(call) + "\n" for call in calls)
+        batch_file = self.client.files.create(
+            file=("batch.jsonl", io.BytesIO(lines.encode("utf-8"))),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+
+    def collect_batch(self, batch_id: str, poll_interval=30) -> dict:
+        """
+        Wait for a submitted batch to finish and return its responses.
+        
+        Args:
+            batch_id (str): The batch ID returned by submit_batch().
+            poll_interval (float, optional): Seconds to wait between status checks.
+                                            Defaults to 30.
+        
+        Returns:
+            dict: Mapping of each request's custom_id to its response text.
+        
+        Raises:
+            RuntimeError: If the batch fails, expires or is cancelled, or if any
+                         request in it failed, naming the failed custom_ids.
+            OpenAIError: If checking the batch or downloading its output fails.
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch_id)
+        
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'")
+        
+        # Requests that failed are written to a separate error file
+        if batch.error_file_id is not None:
+            failed = [
+                json.loads(line)["custom_id"]
+                for line in self.client.files.content(batch.error_file_id).text.splitlines()
+                if line
+            ]
+            if failed:
+                raise RuntimeError(f"Batch {batch_id} requests failed: {', '.join(failed)}")
+        if batch.output_file_id is None:
+            raise RuntimeError(f"Batch {batch_id} completed without an output file")
+        
+        results = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line:
+                continue
+            result = json.loads(line)
+            if result.get("error") or result["response"]["status_code"] != 200:
+                raise RuntimeError(f"Batch request '{result['custom_id']}' failed: {result.get('error') or result['response']['body']}")
+            
+            results[result["custom_id"]] = result["response"]["body"]["choices"][0]["message"]["content"]
+        return results
+
+    def _create(self, request: dict, **options):
+        """
+        Send a chat completion request through its model's rate limiter.
+        
+        Waits until the model's request and token budget allows the call,
+        sends it with retries, and updates the limiter from the response's
+        rate limit headers.
+        
+        Args:
+            request (dict): Keyword arguments built by _request_kwargs().
+            **options: Extra arguments for the call, e.g. stream=True.
+        
+        Returns:
+            ChatCompletion | Stream: The parsed API response.
+        """
+        limiter = rate_limiter(request["model"])
+        limiter.acquire(estimate_tokens(request["model"], request["messages"]))
+        raw = _call_with_retries(self.client.chat.completions.with_raw_response.create, **request, **options)
+        limiter.update(raw.headers)
+        return raw.parse()
+
+    async def _acreate(self, request: dict, **options):
+        """
+        Async counterpart of _create(), bounded by the shared concurrency limit.
+        
+        Each attempt takes its own concurrency slot and rate limiter reservation,
+        so a call waiting to retry does not hold a slot.
+        
+        Args:
+            request (dict): Keyword arguments built by _request_kwargs().
+            **options: Extra arguments for the call.
+        
+        Returns:
+            ChatCompletion | AsyncStream: The parsed API response.
+        """
+        limiter = rate_limiter(request["model"])
+        tokens = estimate_tokens(request["model"], request["messages"])
+        
+        # A slot is held per attempt, so backoff between retries frees it for other calls
+        async def attempt(**kwargs):
+            async with _ASYNC_SLOTS:
+                await limiter.aacquire(tokens)
+                return await self.aclient.chat.completions.with_raw_response.create(**kwargs)
+        
+        raw = await _acall_with_retries(attempt, **request, **options)
+        limiter.update(raw.headers)
+        return raw.parse()
+
+    def _record_response(self, response):
+        """
+        Append a completed (non-streamed) response to self.responses.
         
-        # Format the response with optional paragraph indentation
-        if indent_paragraphs:
-            return response.choices[0].message.content.replace("\n", "\n\t")
+        Args:
+            response (ChatCompletion): The response returned by the API.
+        """
+        if self.keep_full_responses:
+            self.responses.append(response)
         else:
-            return response.choices[0].message.content
-    
+            self.responses.append(_response_record(response.id, response.usage, response.choices[0].finish_reason))
+
+    def _request_kwargs(self, related_text: str, meta_prompt: str) -> dict:
+        """
+        Build the chat completion arguments shared by every request method.
+        
+        The message list is built once per request and reused for both the
+        cache key and the API call. It is ordered from most to least stable
+        (system prompt, transcript so far, current instruction) so that OpenAI's
+        automatic prompt caching can reuse the processed prefix between turns.
+        
+        Args:
+            related_text (str): Conversation context sent as the assistant message.
+            meta_prompt (str): The instruction sent as the user message.
+        
+        Returns:
+            dict: Keyword arguments for client.chat.completions.create().
+        """
+        kwargs = {
+            "model": self.model,
+            "messages": [
+                *self.messages,
+                {"role": "assistant", "content": related_text},
+                {"role": "user", "content": meta_prompt}
+            ],
+            "prompt_cache_key": self.prompt_cache_key
+        }
+        if self.temperature is not None:
+            kwargs["temperature"] = self.temperature
+        if not self.model.startswith(_REASONING_MODEL_PREFIXES):
+            if self.max_tokens is not None:
+                kwargs["max_completion_tokens"] = self.max_tokens
+            if self.stop:
+                kwargs["stop"] = self.stop
+        return kwargs
+
+    def _semantic_query(self, related_text: str, meta_prompt: str) -> str:
+        """
+        Build the text embedded for semantic cache lookups.
+        
+        Only the last few turns of the context are included, which keeps the
+        embedding request small and focuses the comparison on the latest
+        exchange. Persona and topic are not embedded, since the cache itself
+        is kept per agent.
+        
+        Args:
+            related_text (str): Conversation context sent as the assistant message.
+            meta_prompt (str): The instruction sent as the user message.
+        
+        Returns:
+            str: The prompt followed by the last _SEMANTIC_CONTEXT_TURNS turns
+                 of the context.
+        """
+        # Rendered turns are separated by blank lines; message text never contains one
+        turns = related_text.rstrip().rsplit("\n\n", _SEMANTIC_CONTEXT_TURNS)[-_SEMANTIC_CONTEXT_TURNS:]
+        return meta_prompt + "\n\n" + "\n\n".join(turns)
+
+    def _cache_key(self, request: dict):
+        """
+        Compute the response cache key for a request.
+        
+        Args:
+            request (dict): Keyword arguments built by _request_kwargs().
+        
+        Returns:
+            str | None: Hex digest of the model and full message list, or None
+                        when the temperature is non-deterministic and the
+                        response must not be cached.
+        """
+        if self.temperature not in (None, 0):
+            return None
+        return _request_hash(request["model"], request["messages"])
+
+    def close(self):
+        """
+        Release the agent's OpenAI client and its pooled HTTP connections.
+
+        The client is created once in __init__ and reused by every ask() call so
+        that keep-alive connections (and their TLS sessions) are shared between
+        turns. Calling close() shuts those sockets down deterministically instead
+        of waiting for garbage collection.
+
+        Note:
+            The agent cannot make further requests after it has been closed.
+            Agents using the shared connection pool leave it open for the other
+            agents; the shared pool is closed once at interpreter exit.
+        """
+        if self._owns_http_client:
+            self.client.close()
+        if self.semantic_cache is not None:
+            self.semantic_cache.close()
+
+    def __enter__(self):
+        """
+        Enter a context block that closes the agent's client on exit.
+
+        Returns:
+            Agent: The agent instance itself.
+
+        Example:
+            >>> with Agent("Alice", "A thoughtful teacher", "Education") as agent:
+            ...     print(agent.ask("", "What's your initial position?"))
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the agent's client when leaving a context block.
+
+        Args:
+            exc_type (type): Exception type raised inside the block, if any.
+            exc_value (BaseException): Exception instance raised inside the block, if any.
+            traceback (TracebackType): Traceback of the exception, if any.
+        """
+        self.close()
+
     def __repr__(self):
         """
         Return a string representation of the Agent instance.
@@ -153,6 +1004,7 @@ class Debater(Agent):
     Attributes:
         side (Literal['Pro', 'Con']): The debate position this agent will argue.
                                      'Pro' supports the topic, 'Con' opposes it.
+        max_tokens (int): Cap on generated tokens, sized for the 250 word limit.
         
     Inherits all attributes from Agent class:
         name, persona, topic, model, messages, responses, api_key, client
@@ -166,13 +1018,16 @@ class Debater(Agent):
         ... )
         >>> response = debater.ask("", "What's your opening argument?")
     """
-    def __init__(self, name, persona, topic, side: Literal['Pro', 'Con'], model='gpt-5-mini'):
+    __slots__ = ()
+
+    def __init__(self, name, persona, topic, side: Literal['Pro', 'Con'], model='gpt-5-mini', max_tokens=350, **kwargs):
         """
         Initialize a Debater with position-specific constraints and behavior.
         
         Sets up a debate agent by calling the parent Agent constructor and then
-        adding debate-specific system prompts that enforce consistent argumentation
-        from the assigned side and appropriate response length limits.
+        adding debate-specific instructions to the system prompt that enforce
+        consistent argumentation from the assigned side and appropriate response
+        length limits.
         
         Args:
             name (str): Display name for the debater.
@@ -183,24 +1038,36 @@ class Debater(Agent):
                                          'Pro' means arguing in favor of the topic,
                                          'Con' means arguing against it.
             model (str, optional): OpenAI model identifier. Defaults to 'gpt-5-mini'.
+            max_tokens (int, optional): Cap on generated tokens per response, about
+                                       260 words. Defaults to 350. Not applied to
+                                       reasoning models such as gpt-5-mini, whose
+                                       hidden reasoning tokens count against it.
+            **kwargs: Additional keyword arguments forwarded to Agent, such as http_client.
         
         Raises:
             ValueError: If side is not 'Pro' or 'Con', or if parent initialization fails.
             OpenAIError: If there's an issue with OpenAI client setup.
         
         Note:
-            Automatically adds system prompts that:
+            Automatically extends the system prompt with instructions that:
             - Enforce consistent argument from the assigned side
             - Limit responses to approximately 250 words for concise debate format
+            Generation is also capped at max_tokens and ends early at "[END]" or
+            a "---" separator, so no tokens are spent past the word limit.
         """
-        super().__init__(name, persona, topic, model)
+        super().__init__(name, persona, topic, model, **kwargs)
         self.side = side
+        self.max_tokens = max_tokens
+        self.stop = ["\n\n---", "[END]"]
+        if self.semantic_cache is not None:
+            self.semantic_cache.namespace += f"|{self.side}"
         
-        # Add debate-specific system messages
-        self.messages.extend([
-            {"role": "system", "content": f"You are on the {self.side} side of the argument.  You should always argue in favor of your side."},
-            {"role": "system", "content": "Try to keep your responses to a maximum of 250 words."}
-        ])
+        # Fold the debate-specific instructions into the single system message
+        self.messages[0]["content"] += (
+            f" You are on the {self.side} side of the argument and should always argue in favor of your side."
+            " Keep your responses to a maximum of 250 words."
+        )
+        self.prompt_cache_key = _request_hash(self.model, self.messages)
 
 class Moderator(Agent):
     """
@@ -224,7 +1091,9 @@ class Moderator(Agent):
         ... )
         >>> intro = moderator.ask("", "Please introduce tonight's debate")
     """
-    def __init__(self, name, persona, topic, model='gpt-5-mini'):
+    __slots__ = ()
+
+    def __init__(self, name, persona, topic, model='gpt-4o-mini', **kwargs):
         """
         Initialize a Moderator agent with neutral facilitation role.
         
@@ -238,21 +1107,60 @@ class Moderator(Agent):
                           expertise, and approach to facilitating discussions.
                           Should emphasize neutrality and fairness.
             topic (str): The debate topic or subject being moderated.
-            model (str, optional): OpenAI model identifier. Defaults to 'gpt-5-mini'.
+            model (str, optional): OpenAI model identifier. Defaults to 'gpt-4o-mini',
+                                 a smaller and faster model that suits the
+                                 moderator's short procedural prompts.
+            **kwargs: Additional keyword arguments forwarded to Agent, such as http_client.
         
         Raises:
             ValueError: If parent initialization fails.
             OpenAIError: If there's an issue with OpenAI client setup.
         
         Note:
-            The moderator inherits the same system prompts as the base Agent but
+            The moderator inherits the same system prompt as the base Agent but
             doesn't receive side-specific argumentative constraints like Debaters do.
+            Semantic caching is always disabled for moderators.
         """
-        super().__init__(name, persona, topic, model)
+        super().__init__(name, persona, topic, model, **kwargs)
         # Set the moderator's role identifier
         self.side = 'Moderator'
+        
+        # Moderator prompts are free-form questions, so a similar earlier
+        # answer is never a substitute for a fresh one
+        self.semantic_cache = None
 
 
+async def aask_many(pairs):
+    """
+    Answer several independent agent requests concurrently.
+    
+    All requests are in flight at once over the shared HTTP/2 connection pool,
+    so the batch takes about as long as its slowest request rather than the
+    sum of all of them. Identical cacheable requests are sent only once.
+    
+    Args:
+        pairs (Iterable[tuple[Agent, str, str]]): (agent, related_text, meta_prompt)
+                                                  triples, one per request.
+    
+    Returns:
+        list[str]: One response text per request, in the same order.
+    
+    Raises:
+        OpenAIError: If any request fails after retrying with exponential backoff.
+    
+    Note:
+        Only requests that do not depend on each other's answers belong in one
+        call. For unattended runs where latency does not matter, the Batch API
+        (see Agent.submit_batch) is half the price.
+    
+    Example:
+        >>> pro_ideas, con_ideas = await aask_many([
+        ...     (pro, "", "List your talking points."),
+        ...     (con, "", "List your talking points.")
+        ... ])
+    """
+    return await asyncio.gather(*(agent.aask(related_text, meta_prompt) for agent, related_text, meta_prompt in pairs))
+
 if __name__ == "__main__":
     """
     Example usage of the Debater class.
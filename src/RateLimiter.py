@@ -0,0 +1,172 @@
+from functools import lru_cache
+import asyncio
+import threading
+import time
+import tiktoken
+
+class TokenBucket:
+    """
+    A requests-per-minute and tokens-per-minute limiter for OpenAI API calls.
+
+    Keeps two buckets that refill continuously at the configured per-minute
+    rates. Each call reserves one request and its estimated token count before
+    it is sent, sleeping just long enough for the buckets to refill when they
+    run dry. After each response the buckets are corrected from the
+    x-ratelimit-remaining-* headers returned by the API, so the limiter tracks
+    the model's real remaining budget rather than a local guess.
+
+    Attributes:
+        rpm (int): Maximum number of requests per minute.
+        tpm (int): Maximum number of tokens per minute.
+
+    Example:
+        >>> limiter = TokenBucket(rpm=500, tpm=200_000)
+        >>> limiter.acquire(1200)
+        >>> limiter.update(raw_response.headers)
+    """
+    def __init__(self, rpm, tpm):
+        """
+        Initialize full request and token buckets.
+
+        Args:
+            rpm (int): Maximum number of requests per minute.
+            tpm (int): Maximum number of tokens per minute.
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+
+        # Shared by sync callers and the event loop thread
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens):
+        """
+        Reserve capacity for one request if both buckets allow it.
+
+        Args:
+            tokens (int): Estimated number of tokens the request will use.
+
+        Returns:
+            float: 0 if the request was reserved, otherwise the number of
+                   seconds to wait before trying again.
+        """
+        # A single request larger than the whole budget only waits for a full bucket
+        tokens = min(tokens, self.tpm)
+
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                return 0
+
+            return max(
+                (1 - self._requests) * 60 / self.rpm,
+                (tokens - self._tokens) * 60 / self.tpm
+            )
+
+    def acquire(self, tokens):
+        """
+        Block until a request of the given size may be sent.
+
+        Args:
+            tokens (int): Estimated number of tokens the request will use.
+        """
+        wait = self._reserve(tokens)
+        while wait:
+            time.sleep(wait)
+            wait = self._reserve(tokens)
+
+    async def aacquire(self, tokens):
+        """
+        Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            tokens (int): Estimated number of tokens the request will use.
+        """
+        wait = self._reserve(tokens)
+        while wait:
+            await asyncio.sleep(wait)
+            wait = self._reserve(tokens)
+
+    def update(self, headers):
+        """
+        Correct the buckets from the rate limit headers of an API response.
+
+        Args:
+            headers (Mapping[str, str]): HTTP headers of the response.
+        """
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+
+        with self._lock:
+            # The headers describe the budget now, so refill restarts from here
+            self._updated = time.monotonic()
+            if remaining_requests is not None:
+                self._requests = min(self.rpm, float(remaining_requests))
+            if remaining_tokens is not None:
+                self._tokens = min(self.tpm, float(remaining_tokens))
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    """
+    Return the tiktoken encoding for a model, falling back to o200k_base.
+
+    Returns None when the encoding cannot be loaded, e.g. because tiktoken
+    cannot download its BPE file without network access.
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+def estimate_tokens(model, messages):
+    """
+    Estimate the number of prompt tokens a chat request will use.
+
+    Args:
+        model (str): OpenAI model identifier the request is sent to.
+        messages (list): Chat messages in the format sent to the API.
+
+    Returns:
+        int: Approximate prompt token count, including per-message overhead.
+
+    Note:
+        Without a tiktoken encoding, about four characters are counted per
+        token, so an estimate never makes a request fail.
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return sum(len(message["content"]) // 4 + 4 for message in messages)
+    return sum(len(encoding.encode(message["content"])) + 4 for message in messages)
+
+# One limiter per model shared by every agent, since OpenAI applies its
+# request and token limits to each model separately
+_LIMITERS: dict[str, TokenBucket] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+def rate_limiter(model):
+    """
+    Return the limiter for a model, creating it on first use.
+
+    Args:
+        model (str): OpenAI model identifier the requests are sent to.
+
+    Returns:
+        TokenBucket: The limiter shared by all requests to that model.
+    """
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(model)
+        if limiter is None:
+            limiter = _LIMITERS[model] = TokenBucket(rpm=500, tpm=200_000)
+        return limiter
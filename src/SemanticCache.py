@@ -0,0 +1,178 @@
+import sqlite3
+import numpy as np
+
+# OpenAI embedding model used to compare prompts, and its vector size
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+
+class SemanticCache:
+    """
+    A similarity-based cache of agent responses for near-duplicate prompts.
+
+    Debate prompts are frequently paraphrases of one another, so an exact-match
+    cache rarely hits. This cache stores the embedding of each answered prompt
+    alongside the generated text and returns the stored text when a new prompt's
+    embedding is close enough by cosine similarity. Embeddings are kept in a
+    single contiguous float32 NumPy matrix with precomputed row norms, so a
+    lookup is one BLAS matrix-vector product.
+
+    The cache only stores vectors; callers compute embeddings with the OpenAI
+    embeddings endpoint (see EMBEDDING_MODEL) so that both sync and async code
+    paths can share it.
+
+    Given a path, entries are also persisted to a SQLite database so that reruns
+    of a debate can reuse responses from earlier sessions. Entries are grouped
+    by namespace, and a cache only ever sees the entries of its own namespace.
+
+    Attributes:
+        threshold (float): Minimum cosine similarity for a lookup to count as a hit.
+        max_entries (int): Maximum number of stored responses before the least
+                          recently used entry is evicted.
+        texts (list): Response texts, aligned with the rows of the embedding matrix.
+        path (str): SQLite database the entries are persisted to, or None.
+        namespace (str): Key grouping this cache's entries in the database. It
+                        may be changed until the first lookup or add, when the
+                        stored entries are loaded.
+
+    Example:
+        >>> cache = SemanticCache()
+        >>> cache.add(embedding, "My opening statement is...")
+        >>> cache.lookup(similar_embedding)
+        'My opening statement is...'
+    """
+    def __init__(self, threshold=0.92, max_entries=1024, path=None, namespace=""):
+        """
+        Initialize a semantic cache, empty until any persisted entries are loaded.
+
+        Args:
+            threshold (float, optional): Minimum cosine similarity for a hit.
+                                        Defaults to 0.92.
+            max_entries (int, optional): Maximum number of stored responses.
+                                        Defaults to 1024.
+            path (str, optional): SQLite database file to persist entries to.
+                                 Defaults to None (memory only).
+            namespace (str, optional): Key grouping this cache's entries in the
+                                      database. Defaults to an empty string.
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = path
+        self.namespace = namespace
+        self.texts = []
+
+        # Database connection and the row id of each entry, opened on first use
+        self._db = None
+        self._ids = []
+
+        # Stored prompt embeddings, shape (N, EMBEDDING_DIM), and their norms
+        self._emb = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self._norms = np.empty((0,), dtype=np.float32)
+
+        # Logical clock used to find the least recently used entry
+        self._last_used = np.empty((0,), dtype=np.int64)
+        self._clock = 0
+
+    def _open(self):
+        """Open the database, if any, and load this namespace's most recent entries."""
+        if self.path is None or self._db is not None:
+            return
+
+        self._db = sqlite3.connect(self.path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_cache ("
+            "id INTEGER PRIMARY KEY, namespace TEXT NOT NULL, embedding BLOB NOT NULL, text TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS semantic_cache_namespace ON semantic_cache (namespace)")
+        rows = self._db.execute(
+            "SELECT id, embedding, text FROM semantic_cache WHERE namespace = ? ORDER BY id DESC LIMIT ?",
+            (self.namespace, self.max_entries)
+        ).fetchall()[::-1]
+        if not rows:
+            return
+
+        self._ids = [row[0] for row in rows]
+        self.texts = [row[2] for row in rows]
+        self._emb = np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+        self._norms = np.linalg.norm(self._emb, axis=1)
+
+        # Older entries count as less recently used
+        self._last_used = np.arange(1, len(rows) + 1, dtype=np.int64)
+        self._clock = len(rows)
+
+    def lookup(self, embedding):
+        """
+        Return the stored response for the most similar prompt, if close enough.
+
+        Args:
+            embedding (Sequence[float]): Embedding of the prompt being asked.
+
+        Returns:
+            str | None: The cached response text when the best cosine similarity
+                        reaches the threshold, otherwise None.
+        """
+        self._open()
+        if not self.texts:
+            return None
+
+        q = np.asarray(embedding, dtype=np.float32)
+        sims = self._emb @ q / (self._norms * np.linalg.norm(q))
+        idx = int(sims.argmax())
+
+        if sims[idx] < self.threshold:
+            return None
+
+        self._clock += 1
+        self._last_used[idx] = self._clock
+        return self.texts[idx]
+
+    def add(self, embedding, text):
+        """
+        Store a response under its prompt embedding.
+
+        Evicts the least recently used entry once the cache grows beyond
+        max_entries. With a path, the entry is written to the database as well.
+
+        Args:
+            embedding (Sequence[float]): Embedding of the prompt that was answered.
+            text (str): The response text generated for that prompt.
+        """
+        self._open()
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self._db is not None:
+            with self._db:
+                cursor = self._db.execute(
+                    "INSERT INTO semantic_cache (namespace, embedding, text) VALUES (?, ?, ?)",
+                    (self.namespace, vector.tobytes(), text)
+                )
+            self._ids.append(cursor.lastrowid)
+
+        self._clock += 1
+        self._emb = np.vstack([self._emb, vector])
+        self._norms = np.append(self._norms, np.linalg.norm(vector))
+        self._last_used = np.append(self._last_used, self._clock)
+        self.texts.append(text)
+
+        if len(self.texts) > self.max_entries:
+            idx = int(self._last_used.argmin())
+            self._emb = np.delete(self._emb, idx, axis=0)
+            self._norms = np.delete(self._norms, idx)
+            self._last_used = np.delete(self._last_used, idx)
+            del self.texts[idx]
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM semantic_cache WHERE id = ?", (self._ids.pop(idx),))
+
+    def close(self):
+        """
+        Close the database connection, if one is open.
+
+        The in-memory entries remain usable, but later additions are no longer persisted.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            self.path = None
+
+    def __len__(self):
+        """Return the number of stored responses."""
+        return len(self.texts)
@@ -1,6 +1,39 @@
 from Agent import Agent
 from datetime import datetime
+from types import SimpleNamespace
+from typing import Iterable, Iterator, Optional, TextIO, Union
 import json
+import os
+import shutil
+
+# Separator lines used when rendering transcripts
+_EQ = "="*40
+_DASH = "-"*40
+
+# Closing lines of a final transcript
+_FOOTER = (_EQ + "\n\n", "[END OF DEBATE]")
+
+def _header_lines(topic, pro, con):
+    """Return the heading lines that open every rendered transcript."""
+    return (
+        "[TRANSCRIPT OF DEBATE]\n\n",
+        _EQ + "\n",
+        f"Topic: {topic}\n",
+        f"Pro: {pro.name}  |  Con: {con.name}\n",
+        _EQ + "\n\n"
+    )
+
+# Timestamp layout shown in rendered transcripts
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def _heading(time_str, agent):
+    """Render the timestamp and speaker line that opens every transcript entry."""
+    return f"[{time_str}] {agent.name} ({agent.side}):\n\t"
+
+def _format_entry(entry):
+    """Render one transcript entry as its timestamped, speaker-labelled block."""
+    message = entry['message'].replace("\n", "\n\t")
+    return _heading(entry['time_str'], entry['agent']) + f"{message}\n"
 
 class Transcript:
     """
@@ -18,8 +51,21 @@ class Transcript:
         messages (list): Chronologically ordered list of message dictionaries.
                         Each entry contains:
                         - timestamp (datetime): When the message was recorded
+                        - time_str (str): The timestamp formatted for display
                         - agent (Agent): The Agent instance that sent the message  
                         - message (str): The actual message content
+                        Messages should only be added through add_message().
+        log_path (str): Path of the JSONL file each message is appended to as it
+                       is recorded, or None if the transcript is only kept in memory.
+        summary (str): Summary of the earliest messages, used by render_compressed()
+                      in place of those messages, or None.
+        summarized (int): Number of leading messages covered by summary.
+        summary_task (asyncio.Task): Background task bringing summary up to date,
+                                    or None if none has been started.
+        warmed (int): Number of messages the last prompt cache warm-up covered,
+                     or None if no warm-up has been sent.
+        partial_path (str): Path of the file each rendered message is streamed to
+                           for save_transcript() to assemble, or None.
     
     Example:
         >>> transcript = Transcript()
@@ -27,7 +73,7 @@ class Transcript:
         >>> transcript.add_message(agent, "I believe we need stronger action...")
         >>> print(transcript.print_last_message())
     """
-    def __init__(self):
+    def __init__(self, log_path: Optional[str] = None, partial_path: Optional[str] = None):
         """
         Initialize a new empty Transcript instance.
         
@@ -35,12 +81,86 @@ class Transcript:
         debate interactions. The transcript starts with no messages and will
         build up a chronological record as agents participate in the discussion.
         
-        No parameters are required as the transcript begins empty and is
-        populated through the add_message() method during debate sessions.
+        Args:
+            log_path (str, optional): Path of a JSONL file to append every message
+                                     to the moment it is recorded, so that a debate
+                                     survives a crash and can be reloaded with
+                                     from_log(). Defaults to None (memory only).
+            partial_path (str, optional): Path of a scratch file that each rendered
+                                     message is written to as it is recorded.
+                                     save_transcript() then copies the body from
+                                     it instead of rendering it in one large
+                                     write at the end. It is scratch space that
+                                     is truncated when opened, so a file left by
+                                     a crashed session is overwritten; pass a
+                                     log_path to keep a debate recoverable.
+                                     Defaults to None.
         """
         self.messages = []
+        self.log_path = log_path
+        self.partial_path = partial_path
+        self.summary = None
+        self.summarized = 0
+        self.summary_task = None
+        self.warmed = None
+        
+        # Each message pre-rendered once, as it appears in print_transcript()
+        self._rendered = []
+        
+        # Last rendered transcript and the arguments it was rendered with
+        self._cached = None
+        self._cached_key = None
+        
+        # Line-buffered so each message reaches the file as soon as it is written
+        self._log = open(log_path, "a", buffering=1, encoding="utf-8") if log_path else None
+        
+        # Block-buffered, since it is only read back when the transcript is saved
+        self._partial = open(partial_path, "w", buffering=64*1024, encoding="utf-8") if partial_path else None
+    
+    @classmethod
+    def from_log(cls, log_path: str):
+        """
+        Rebuild a transcript from a JSONL log written by a previous session.
+        
+        Speakers are restored as lightweight objects with name and side
+        attributes, which is all that rendering requires.
+        
+        Args:
+            log_path (str): Path of the JSONL file passed as log_path earlier.
+        
+        Returns:
+            Transcript: A memory-only transcript holding the logged messages.
         
-    def add_message(self, agent: Agent, message: str):
+        Example:
+            >>> transcript = Transcript.from_log("debate.jsonl")
+            >>> transcript.save_transcript("debate.txt", pro_agent, con_agent, topic)
+        """
+        transcript = cls()
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                timestamp = datetime.fromisoformat(record["ts"])
+                transcript._append({
+                    "timestamp": timestamp,
+                    "time_str": timestamp.strftime(_TIME_FORMAT),
+                    "agent": SimpleNamespace(name=record["agent"], side=record["side"]),
+                    "message": record["msg"]
+                })
+        return transcript
+    
+    def _append(self, entry):
+        """Record a message entry and render it once for later transcripts."""
+        rendered = _format_entry(entry) + _DASH + "\n\n"
+        self.messages.append(entry)
+        self._rendered.append(rendered)
+        self._cached = None
+        if self._partial is not None:
+            self._partial.write(rendered)
+        
+    def add_message(self, agent: Agent, message: Union[str, Iterable[str]], stream: Optional[TextIO] = None,
+                    timestamp: Optional[datetime] = None):
         """
         Record a new message from an agent with automatic timestamping.
         
@@ -52,19 +172,51 @@ class Transcript:
             agent (Agent): The Agent instance that is sending the message.
                           This should be a Debater, Moderator, or base Agent object
                           that provides name and side information.
-            message (str): The actual message content or response from the agent.
-                          Can include multi-line text, arguments, rebuttals, etc.
+            message (str | Iterable[str]): The actual message content or response from
+                          the agent. Can include multi-line text, arguments, rebuttals,
+                          etc. An iterable of text pieces, such as Agent.ask_stream(),
+                          is consumed and joined into a single message.
+            stream (TextIO, optional): Open file handle that each piece of a streamed
+                          message is written to as it arrives, e.g. sys.stdout or a
+                          log file. Defaults to None.
+            timestamp (datetime, optional): When the message was made, e.g. the value
+                          passed to format_heading() while it was displayed.
+                          Defaults to None, which uses the current time.
         
         Note:
-            The timestamp is automatically generated using datetime.now() when
-            the message is added, not when it was originally generated by the agent.
+            Without a timestamp, it is automatically generated using datetime.now()
+            when the message is added, not when it was originally generated by the agent.
+            It is formatted for display once here rather than on every render,
+            and the whole entry is rendered once for print_transcript().
+            Messages are stored unformatted; paragraph breaks are indented with
+            tabs only when the transcript is rendered.
             
         Example:
             >>> transcript = Transcript()
             >>> debater = Debater("Alice", "Lawyer", "Tax policy", "Pro")
             >>> transcript.add_message(debater, "Taxes should be progressive because...")
+            >>> transcript.add_message(debater, debater.ask_stream("", "Rebuttal."), stream=sys.stdout)
         """
-        self.messages.append({"timestamp": datetime.now(), "agent": agent, "message": message})
+        if not isinstance(message, str):
+            pieces = []
+            for piece in message:
+                if stream is not None:
+                    stream.write(piece.replace("\n", "\n\t"))
+                    stream.flush()
+                pieces.append(piece)
+            message = "".join(pieces)
+        
+        now = timestamp or datetime.now()
+        self._append({
+            "timestamp": now,
+            "time_str": now.strftime(_TIME_FORMAT),
+            "agent": agent,
+            "message": message
+        })
+        
+        # Persist the message immediately when logging is enabled
+        if self._log is not None:
+            self._log.write(json.dumps({"ts": now.isoformat(), "agent": agent.name, "side": agent.side, "msg": message}) + "\n")
         
     def print_transcript(self, topic, pro: Agent, con: Agent, final=False):
         """
@@ -91,31 +243,72 @@ class Transcript:
                  - Message separators for readability
                  - Optional end-of-debate footer
         
+        Note:
+            The rendered string is cached until the next add_message(), so repeated
+            calls with the same arguments between messages do not rebuild it.
+        
         Example:
             >>> transcript_text = transcript.print_transcript(
             ...     "Universal Healthcare", pro_agent, con_agent, final=True
             ... )
             >>> print(transcript_text)
         """
-        r_string = ""
-        r_string += "[TRANSCRIPT OF DEBATE]\n\n"
-        r_string += "="*40 + "\n"
-        r_string += f"Topic: {topic}\n"
-        r_string += f"Pro: {pro.name}  |  Con: {con.name}\n"
-        r_string += "="*40 + "\n\n"
+        key = (topic, pro.name, con.name, final)
+        if self._cached is None or self._cached_key != key:
+            self._cached = "".join(self.iter_transcript(topic, pro, con, final))
+            self._cached_key = key
+        return self._cached
+    
+    def iter_transcript(self, topic, pro: Agent, con: Agent, final=False) -> Iterator[str]:
+        """
+        Yield the formatted debate transcript one piece at a time.
+        
+        Produces exactly the text returned by print_transcript(), but as a
+        sequence of consecutive pieces (header lines, then one pre-rendered
+        piece per message) so callers can write the transcript out without holding
+        the whole string in memory.
+        
+        Args:
+            topic (str): The debate topic or resolution being discussed.
+            pro (Agent): The Agent arguing for the pro side of the debate.
+            con (Agent): The Agent arguing for the con side of the debate.
+            final (bool, optional): Whether to add the "[END OF DEBATE]" footer.
+                                   Defaults to False.
+        
+        Yields:
+            str: Consecutive pieces of the formatted transcript.
+        
+        Example:
+            >>> with open("debate.txt", "w", encoding="utf-8") as f:
+            ...     f.writelines(transcript.iter_transcript(topic, pro_agent, con_agent))
+        """
+        yield from _header_lines(topic, pro, con)
         
         # Add each message with timestamp and speaker information
-        for entry in self.messages:
-            time_str = entry["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
-            r_string += f"[{time_str}] {entry['agent'].name} ({entry['agent'].side}):\n\t{entry['message']}\n"
-            r_string += "-"*40 + "\n\n"
+        yield from self._rendered
         
         # Add final marker if this is the complete transcript
         if final:
-            r_string += "="*40 + "\n\n"
-            r_string += "[END OF DEBATE]"
-            
-        return r_string
+            yield from _FOOTER
+    
+    @staticmethod
+    def format_heading(agent: Agent, timestamp: datetime) -> str:
+        """
+        Render the line that opens a transcript entry, ahead of its message.
+        
+        Lets a caller display a message as it streams in with the same layout as
+        print_last_message(); passing the same timestamp to add_message() keeps
+        the displayed and recorded times identical.
+        
+        Args:
+            agent (Agent): The Agent whose message follows.
+            timestamp (datetime): The time shown for the message.
+        
+        Returns:
+            str: The "[YYYY-MM-DD HH:MM:SS] SpeakerName (Side):" line and the tab
+                 that indents the message.
+        """
+        return _heading(timestamp.strftime(_TIME_FORMAT), agent)
     
     def print_last_message(self):
         """
@@ -140,9 +333,51 @@ class Transcript:
             return ""
         
         # Get the most recent message
-        entry = self.messages[-1]
-        time_str = entry["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
-        return f"[{time_str}] {entry['agent'].name} ({entry['agent'].side}):\n\t{entry['message']}\n\n"
+        return _format_entry(self.messages[-1]) + "\n"
+    
+    def render_messages(self, start=0, stop=None):
+        """
+        Render a slice of the recorded messages without the transcript header.
+        
+        Args:
+            start (int, optional): Index of the first message to render. Defaults to 0.
+            stop (int, optional): Index one past the last message to render.
+                                 Defaults to None (through the latest message).
+        
+        Returns:
+            str: The selected messages, formatted and separated as in print_transcript().
+        """
+        return "".join(self._rendered[start:stop])
+    
+    def render_compressed(self, last_k=4, summary=None):
+        """
+        Render a bounded context window: a summary of earlier turns plus the latest turns.
+        
+        Sending this instead of print_transcript() keeps the prompt size roughly
+        constant as a debate grows, rather than resending every turn each time.
+        Every message not covered by the summary is included verbatim, so at
+        least the last last_k messages and nothing less than everything after
+        the first self.summarized messages.
+        
+        Args:
+            last_k (int, optional): Minimum number of most recent messages included
+                                   verbatim. Defaults to 4.
+            summary (str, optional): Summary of the first self.summarized messages.
+                                    Defaults to None, which uses self.summary.
+        
+        Returns:
+            str: The summary, if any, followed by the messages it does not cover.
+        
+        Example:
+            >>> context = transcript.render_compressed(last_k=4)
+            >>> reply = pro_agent.ask(context, "Rebuttal.")
+        """
+        if summary is None:
+            summary = self.summary
+        recent = self.render_messages(max(min(len(self.messages) - last_k, self.summarized), 0))
+        if summary is None:
+            return recent
+        return f"Prior debate summary: {summary}\n\n" + recent
     
     def save_transcript(self, filename: str, pro: Agent, con: Agent, topic: str):
         """
@@ -151,6 +386,10 @@ class Transcript:
         Writes the full formatted transcript to a specified file with UTF-8 encoding.
         The saved file includes all the same formatting as print_transcript() with
         the final=True flag, creating a permanent record of the debate session.
+        The transcript is streamed to the file piece by piece via iter_transcript(),
+        or, with a partial_path, the already written message body is copied over
+        from that file. The result is written to a temporary file and moved into
+        place, so an existing transcript is never left half overwritten.
         
         Args:
             filename (str): Path and name for the output file. Should include
@@ -175,5 +414,85 @@ class Transcript:
             ...     "Universal Healthcare"
             ... )
         """
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(self.print_transcript(topic, pro, con, final=True))
\ No newline at end of file
+        tmp = filename + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            if self._partial is None:
+                f.writelines(self.iter_transcript(topic, pro, con, final=True))
+            else:
+                f.writelines(_header_lines(topic, pro, con))
+                self._partial.flush()
+                with open(self.partial_path, encoding='utf-8') as body:
+                    shutil.copyfileobj(body, f)
+                f.writelines(_FOOTER)
+        os.replace(tmp, filename)
+
+    def run_offline(self, topic, pro: Agent, con: Agent, turns: list[str], poll_interval=30):
+        """
+        Run an unattended debate through the OpenAI Batch API.
+        
+        Each turn submits both debaters' responses as a single batch, waits for
+        it to complete, and records the Pro then Con response. Batch requests
+        are half the price of synchronous calls, which suits offline runs where
+        nobody is watching and latency does not matter.
+        
+        Args:
+            topic (str): The debate topic or resolution being discussed.
+            pro (Agent): The Agent arguing for the pro side of the debate.
+            con (Agent): The Agent arguing for the con side of the debate.
+            turns (list[str]): The prompt given to both debaters for each turn,
+                              e.g. opening argument, rebuttals, closing statement.
+            poll_interval (float, optional): Seconds between batch status checks.
+                                            Defaults to 30.
+        
+        Note:
+            Both debaters in a turn respond to the same transcript state, since
+            their requests are generated together. A batch can take up to 24
+            hours to complete.
+        
+        Example:
+            >>> transcript.run_offline(topic, pro_agent, con_agent,
+            ...     ["Make your opening argument.", "Rebuttal.", "Closing statement."])
+        """
+        for prompt in turns:
+            context = self.print_transcript(topic, pro, con)
+            batch_id = pro.submit_batch([
+                pro.batch_call("pro", context, prompt),
+                con.batch_call("con", context, prompt)
+            ])
+            results = pro.collect_batch(batch_id, poll_interval=poll_interval)
+            
+            self.add_message(pro, results["pro"])
+            self.add_message(con, results["con"])
+    
+    def close(self):
+        """
+        Close the JSONL log and partial transcript files, if they are open.
+        
+        The in-memory transcript remains usable for rendering and saving.
+        """
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        if self._partial is not None:
+            self._partial.close()
+            self._partial = None
+    
+    def __enter__(self):
+        """
+        Enter a context block that closes the log files on exit.
+        
+        Returns:
+            Transcript: The transcript instance itself.
+        """
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the log files when leaving a context block.
+        
+        Args:
+            exc_type (type): Exception type raised inside the block, if any.
+            exc_value (BaseException): Exception instance raised inside the block, if any.
+            traceback (TracebackType): Traceback of the exception, if any.
+        """
+        self.close()
@@ -0,0 +1,23 @@
+import atexit
+import httpx
+
+# One pooled HTTP client shared by every Agent so that all debate participants
+# reuse the same keep-alive TCP/TLS connections to the OpenAI API instead of
+# each opening (and handshaking) a pool of their own.
+SHARED_HTTPX = httpx.Client(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+    timeout=60.0
+)
+
+# Release the pooled sockets once, when the interpreter shuts down
+atexit.register(SHARED_HTTPX.close)
+
+# Async counterpart used by Agent.aask() so concurrent agent calls share one
+# pool as well. HTTP/2 lets those concurrent calls share a single multiplexed
+# connection. Its connections belong to the event loop that opened them, so it
+# is closed by the coroutine that runs the debate (see main.py) rather than at exit.
+SHARED_ASYNC_HTTPX = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+    timeout=180.0
+)
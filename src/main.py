@@ -1,6 +1,38 @@
+import asyncio
+import os
+import sys
+import threading
 import Agent
+from openai import OpenAIError
+from datetime import datetime
+from _http import SHARED_ASYNC_HTTPX
 from Transcript import Transcript
 
+# Past this many messages, debaters get a summary plus the most recent turns
+COMPRESS_AFTER = 8
+RECENT_TURNS = 4
+
+# Instructions sent with each kind of turn, built once at import
+IDEAS_PROMPT = "Give the moderator a list of what you would like to talk about in the debate."
+INTRO_PROMPT = "Give an introduction of the debate's topic and members."
+OPENING_PROMPT = "Make your opening argument to the moderator's prompt."
+REBUTTAL_PROMPT = "Rebuttal."
+CLOSING_PROMPT = "Closing statement."
+CLOSING_REMARKS = "Thank you both for your participation in this debate. Now, please give your closing statements."
+SUMMARY_PROMPT = "Summarize the debate so far in one short paragraph, keeping each side's main arguments."
+
+# Single-letter answers accepted at the interactive prompts, in either case
+_QUIT = frozenset("qQ")
+_NO = frozenset("nN")
+_YES = frozenset("yY")
+
+# Context for an automated introduction, filled in with format_map()
+INTRO_TEMPLATE = (
+    "Topic: {topic}\n"
+    "Pro: {pro_name}, {pro_persona}\n"
+    "Con: {con_name}, {con_persona}"
+)
+
 # Predefined personality profiles for debate agents
 PERSONALITY_PROFILES = {
     "Dave": {
@@ -35,31 +67,37 @@ PERSONALITY_PROFILES = {
     }
 }
 
+# Profile order and menu text, fixed once the profiles are defined
+_PROFILE_KEYS = tuple(PERSONALITY_PROFILES)
+_PROFILE_COUNT = len(_PROFILE_KEYS)
+_CUSTOM_CHOICE = _PROFILE_COUNT + 1
+_PROFILE_MENU = "\n".join([
+    "\nAvailable Debate Personalities:",
+    "=" * 50,
+    *(f"{i}. {profile['name']} - {profile['description']}" for i, profile in enumerate(PERSONALITY_PROFILES.values(), 1)),
+    f"{_CUSTOM_CHOICE}. Custom - Create your own personality",
+    "=" * 50
+])
+
 def display_personality_options():
     """Display available personality profiles for user selection."""
-    print("\nAvailable Debate Personalities:")
-    print("=" * 50)
-    for i, (key, profile) in enumerate(PERSONALITY_PROFILES.items(), 1):
-        print(f"{i}. {profile['name']} - {profile['description']}")
-    print(f"{len(PERSONALITY_PROFILES) + 1}. Custom - Create your own personality")
-    print("=" * 50)
+    print(_PROFILE_MENU)
 
 def get_personality_choice(side_name):
     """Get user's choice for pro or con side personality."""
     while True:
         try:
-            choice = input(f"\nSelect personality for {side_name} side (1-{len(PERSONALITY_PROFILES) + 1}): ").strip()
+            choice = input(f"\nSelect personality for {side_name} side (1-{_CUSTOM_CHOICE}): ").strip()
             choice_num = int(choice)
             
-            if 1 <= choice_num <= len(PERSONALITY_PROFILES):
+            if 1 <= choice_num <= _PROFILE_COUNT:
                 # Return selected predefined personality
-                profile_key = list(PERSONALITY_PROFILES.keys())[choice_num - 1]
-                return PERSONALITY_PROFILES[profile_key]
-            elif choice_num == len(PERSONALITY_PROFILES) + 1:
+                return PERSONALITY_PROFILES[_PROFILE_KEYS[choice_num - 1]]
+            elif choice_num == _CUSTOM_CHOICE:
                 # Create custom personality
                 return create_custom_personality()
             else:
-                print(f"Please enter a number between 1 and {len(PERSONALITY_PROFILES) + 1}")
+                print(f"Please enter a number between 1 and {_CUSTOM_CHOICE}")
         except ValueError:
             print("Please enter a valid number")
 
@@ -83,86 +121,317 @@ def create_custom_personality():
         "description": "Custom personality"
     }
 
-if __name__ == "__main__":
-    transcript = Transcript()
-    
-    print("Welcome to the AI Debate Platform!")
-    print("=" * 40)
-    
-    # Get debate topic from user
-    topic = input("Enter debate topic: ")
-    
-    # Display personality options and get user choices
-    display_personality_options()
-    
-    print(f"\nDebate Topic: {topic}")
-    pro_profile = get_personality_choice("PRO")
-    con_profile = get_personality_choice("CON")
-    
-    # Create the selected agents
-    pro_agent = Agent.Debater(
-        name=pro_profile["name"],
-        persona=pro_profile["persona"],
-        topic=topic,
-        side='Pro'
-    )
-    con_agent = Agent.Debater(
-        name=con_profile["name"],
-        persona=con_profile["persona"],
-        topic=topic,
-        side='Con'
-    )
-    moderator = Agent.Moderator(
-        name='User',
-        persona="The User",
-        topic=topic
-    )
+async def summarize_older(transcript, moderator, stop):
+    """
+    Fold messages up to stop into the transcript's running summary.
+    
+    Args:
+        transcript (Transcript): The debate transcript so far.
+        moderator (Agent.Moderator): The agent whose model writes the summary.
+        stop (int): Index one past the last message the new summary covers.
+    
+    Note:
+        A failed request leaves the previous summary in place; the messages it
+        would have covered are still sent verbatim and summarized next time.
+    """
+    previous = f"Summary so far: {transcript.summary}\n\n" if transcript.summary else ""
+    try:
+        summary = await moderator.aask(
+            previous + transcript.render_messages(transcript.summarized, stop),
+            SUMMARY_PROMPT
+        )
+    except OpenAIError:
+        return
+    transcript.summary = summary
+    transcript.summarized = stop
+
+async def debate_context(transcript, topic, pro_agent, con_agent, moderator):
+    """
+    Build the transcript context sent with the next debater turn.
+    
+    Short debates are sent in full. Past COMPRESS_AFTER messages, debaters get
+    a running summary followed by every message it does not cover yet, which
+    always includes the last RECENT_TURNS messages. Once at least RECENT_TURNS
+    more messages have fallen out of the recent window, the moderator's model
+    brings the summary up to date in the background, so the current turn does
+    not wait for it.
+    
+    Args:
+        transcript (Transcript): The debate transcript so far.
+        topic (str): The debate topic.
+        pro_agent (Agent.Debater): The Pro debater.
+        con_agent (Agent.Debater): The Con debater.
+        moderator (Agent.Moderator): The agent whose model writes the summary.
+    
+    Returns:
+        str: The context to pass as related_text to the next aask() call.
+    """
+    if len(transcript.messages) <= COMPRESS_AFTER:
+        return transcript.print_transcript(topic, pro_agent, con_agent)
+    
+    # At most one summary runs at a time for each transcript
+    older = len(transcript.messages) - RECENT_TURNS
+    task = transcript.summary_task
+    if older - transcript.summarized >= RECENT_TURNS and (task is None or task.done()):
+        transcript.summary_task = asyncio.ensure_future(summarize_older(transcript, moderator, older))
+    return transcript.render_compressed(last_k=RECENT_TURNS)
+
+async def cancel_summary(transcript):
+    """
+    Stop a transcript's background summary and wait until it has ended.
+    
+    Called once no further turns need the summary, so that the request does not
+    outlive the debate or the connection pool it is sent through.
+    
+    Args:
+        transcript (Transcript): The debate transcript whose summary_task is stopped.
+    """
+    task = transcript.summary_task
+    if task is not None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+# Prompt cache warm-ups still in flight, referenced until they finish
+_WARMUPS = set()
+
+async def read_moderation(prompt, transcript, topic, pro_agent, con_agent):
+    """
+    Read the user's input without blocking the event loop.
+    
+    While the user is typing, Pro's prompt cache is warmed with the current
+    transcript, which starts Pro's next context as long as the transcript is
+    still sent in full. Nothing is sent again for a transcript that has not
+    changed since the last warm-up, e.g. when the user declines a rebuttal.
+    
+    Args:
+        prompt (str): The text shown before the user's input.
+        transcript (Transcript): The debate transcript so far.
+        topic (str): The debate topic.
+        pro_agent (Agent.Debater): The Pro debater, who speaks next.
+        con_agent (Agent.Debater): The Con debater.
+    
+    Returns:
+        str: The line the user entered.
+    """
+    count = len(transcript.messages)
+    if count < COMPRESS_AFTER and count != transcript.warmed:
+        transcript.warmed = count
+        warmup = asyncio.ensure_future(pro_agent.awarm(transcript.print_transcript(topic, pro_agent, con_agent)))
+        _WARMUPS.add(warmup)
+        warmup.add_done_callback(_WARMUPS.discard)
+    return await read_line(prompt)
+
+def _resolve(future, line, error):
+    """Complete a read_line() future on the event loop, unless it was cancelled."""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(line)
+
+async def read_line(prompt):
+    """
+    Await a line typed by the user without blocking the event loop.
+    
+    input() runs on a daemon thread that hands its result back to the loop,
+    rather than in the default executor, which asyncio.run() waits for on
+    shutdown: Ctrl-C at a prompt then ends the session at once instead of
+    waiting for the user to press Enter.
+    
+    Args:
+        prompt (str): The text shown before the user's input.
     
+    Returns:
+        str: The line the user entered.
+    
+    Raises:
+        EOFError: If stdin is closed before a line is read.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    # The thread keeps a reference to stdin so that interpreter shutdown never
+    # closes it while the thread is still blocked reading from it
+    def read(stdin=sys.stdin):
+        line = error = None
+        try:
+            line = input(prompt)
+        except Exception as exc:
+            error = exc
+        try:
+            loop.call_soon_threadsafe(_resolve, future, line, error)
+        except RuntimeError:
+            # The loop already closed, e.g. after an interrupt
+            pass
+    
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+async def take_turn(speaker, meta_prompt, transcript, topic, pro_agent, con_agent, moderator):
+    """
+    Have one debater respond, printing the response as it streams in, then record it.
+    
+    Args:
+        speaker (Agent.Debater): The debater taking the turn.
+        meta_prompt (str): The instruction for this turn, e.g. REBUTTAL_PROMPT.
+        transcript (Transcript): The debate transcript the response is added to.
+        topic (str): The debate topic.
+        pro_agent (Agent.Debater): The Pro debater.
+        con_agent (Agent.Debater): The Con debater.
+        moderator (Agent.Moderator): The moderator, used to summarize long debates.
+    """
+    context = await debate_context(transcript, topic, pro_agent, con_agent, moderator)
+    
+    # Same layout as print_last_message(), written piece by piece
+    started = datetime.now()
+    print(Transcript.format_heading(speaker, started), end="", flush=True)
+    pieces = []
+    async for piece in speaker.astream(context, meta_prompt):
+        print(piece.replace("\n", "\n\t"), end="", flush=True)
+        pieces.append(piece)
+    print("\n\n")
+    
+    transcript.add_message(speaker, "".join(pieces), timestamp=started)
+
+async def run_debate(pro_agent, con_agent, moderator, transcript, topic, automated_intro=False):
+    """
+    Run a moderated debate between two debaters and save its transcript.
+    
+    Collects both debaters' talking points, then alternates moderator input
+    with Pro and Con turns until the user ends the debate, finishing with
+    closing statements. Each turn's reply is part of the next speaker's
+    context, so turns are awaited one at a time.
+    
+    Args:
+        pro_agent (Agent.Debater): The Pro debater.
+        con_agent (Agent.Debater): The Con debater.
+        moderator (Agent.Moderator): The moderator recorded for user input.
+        transcript (Transcript): The transcript the debate is recorded in.
+        topic (str): The debate topic.
+        automated_intro (bool, optional): Whether the moderator's model writes the
+                                         introduction instead of the user.
+                                         Defaults to False.
+    """
     # Debate start with moderation
     print(f"\nDebate Topic: {topic}\n")
     print(f"Pro: {pro_agent.name}  |  Con: {con_agent.name}\n")
-    print(f"Here is what {pro_agent.name} would like to say about the topic:\n{pro_agent.ask('', 'Give the moderator a list of what you would like to talk about in the debate.', indent_paragraphs=False)}\n")
-    print(f"Here is what {con_agent.name} would like to say about the topic:\n{con_agent.ask('', 'Give the moderator a list of what you would like to talk about in the debate.', indent_paragraphs=False)}\n")
+    # The topic lists and an automated introduction only depend on the agents'
+    # setup, so all of them are requested together
+    requests = [
+        (pro_agent, '', IDEAS_PROMPT),
+        (con_agent, '', IDEAS_PROMPT)
+    ]
+    if automated_intro:
+        requests.append((moderator, INTRO_TEMPLATE.format_map({
+            "topic": topic,
+            "pro_name": pro_agent.name,
+            "pro_persona": pro_agent.persona,
+            "con_name": con_agent.name,
+            "con_persona": con_agent.persona
+        }), INTRO_PROMPT))
+    pro_ideas, con_ideas, *intro = await Agent.aask_many(requests)
+    print(f"Here is what {pro_agent.name} would like to say about the topic:\n{pro_ideas}\n")
+    print(f"Here is what {con_agent.name} would like to say about the topic:\n{con_ideas}\n")
     
-    moderation = input(f"Give an introduction of the debates topic and members.\n>")
+    if automated_intro:
+        moderation = intro[0]
+        print(f"{moderator.name}: {moderation}\n")
+    else:
+        moderation = input(f"Give an introduction of the debates topic and members.\n>")
     transcript.add_message(moderator, moderation)
     
     while True:
         # run through debate rounds until user decides to end
-        moderation = input(f"What would you like {pro_agent.name} to respond to? (q to end debate)\n>")
-        if moderation.lower() == 'q':
+        moderation = await read_moderation(
+            f"What would you like {pro_agent.name} to respond to? (q to end debate)\n>",
+            transcript, topic, pro_agent, con_agent
+        )
+        if moderation in _QUIT:
             break
         
         transcript.add_message(moderator, moderation)
         
-        transcript.add_message(pro_agent, pro_agent.ask(transcript.print_transcript(topic, pro_agent, con_agent), "Make your opening argument to the moderator's prompt."))
-        print(transcript.print_last_message())
-        
-        transcript.add_message(con_agent, con_agent.ask(transcript.print_transcript(topic, pro_agent, con_agent), "Make your opening argument to the moderator's prompt."))
-        print(transcript.print_last_message())
+        for speaker in (pro_agent, con_agent):
+            await take_turn(speaker, OPENING_PROMPT, transcript, topic, pro_agent, con_agent, moderator)
         
         while True:
-            moderation = input(f"Would you like a(nother) round of rebuttals? (y/n)\n>")
-            if moderation.lower() == 'n':
+            moderation = await read_moderation(
+                f"Would you like a(nother) round of rebuttals? (y/n)\n>",
+                transcript, topic, pro_agent, con_agent
+            )
+            if moderation in _NO:
                 break
             
-            transcript.add_message(pro_agent, pro_agent.ask(transcript.print_transcript(topic, pro_agent, con_agent), "Rebuttal."))
-            print(transcript.print_last_message())
-            
-            transcript.add_message(con_agent, con_agent.ask(transcript.print_transcript(topic, pro_agent, con_agent), "Rebuttal."))
-            print(transcript.print_last_message())
-    
-    transcript.add_message(moderator, "Thank you both for your participation in this debate. Now, please give your closing statements.")
+            for speaker in (pro_agent, con_agent):
+                await take_turn(speaker, REBUTTAL_PROMPT, transcript, topic, pro_agent, con_agent, moderator)
     
-    transcript.add_message(pro_agent, pro_agent.ask(transcript.print_transcript(topic, pro_agent, con_agent), "Closing statement."))
-    print(transcript.print_last_message())
+    transcript.add_message(moderator, CLOSING_REMARKS)
     
-    transcript.add_message(con_agent, con_agent.ask(transcript.print_transcript(topic, pro_agent, con_agent), "Closing statement."))
-    print(transcript.print_last_message())
+    for speaker in (pro_agent, con_agent):
+        await take_turn(speaker, CLOSING_PROMPT, transcript, topic, pro_agent, con_agent, moderator)
     
+    await cancel_summary(transcript)
     transcript.save_transcript("transcript.txt", pro_agent, con_agent, topic)
-    print("\n\nFinal transcript has been saved")
+    print("\n\nFinal transcript has been saved", flush=True)
+
+async def main():
+    """
+    Run an interactive debate from the command line.
+
+    Prompts for a topic, both debaters and whether the moderator introduction is
+    automated, then hands the debate to run_debate().
+    """
+    # Block-buffer the terminal so multi-line output is written in one go. input()
+    # flushes before every prompt, and streamed turns flush each piece themselves.
+    sys.stdout.reconfigure(line_buffering=False)
+    
+    # Close the shared async connection pool on this event loop once the debate ends
+    async with SHARED_ASYNC_HTTPX:
+        # Messages are written out as they arrive; save_transcript() assembles them.
+        # The partial file is scratch space, overwritten by the next session.
+        transcript = Transcript(partial_path="transcript.txt.partial")
     
+        print("Welcome to the AI Debate Platform!")
+        print("=" * 40)
     
+        # Get debate topic from user
+        topic = input("Enter debate topic: ")
     
-    
\ No newline at end of file
+        # Display personality options and get user choices
+        display_personality_options()
+    
+        print(f"\nDebate Topic: {topic}")
+        pro_profile = get_personality_choice("PRO")
+        con_profile = get_personality_choice("CON")
+    
+        # Create the selected agents
+        pro_agent = Agent.Debater(
+            name=pro_profile["name"],
+            persona=pro_profile["persona"],
+            topic=topic,
+            side='Pro'
+        )
+        con_agent = Agent.Debater(
+            name=con_profile["name"],
+            persona=con_profile["persona"],
+            topic=topic,
+            side='Con'
+        )
+        moderator = Agent.Moderator(
+            name='User',
+            persona="The User",
+            topic=topic
+        )
+    
+        automated_intro = input("Should the moderator introduce the debate automatically? (y/n)\n>") in _YES
+        try:
+            await run_debate(pro_agent, con_agent, moderator, transcript, topic, automated_intro)
+        finally:
+            # Also when the debate ends early, before the pool below is closed
+            await cancel_summary(transcript)
+        transcript.close()
+        os.remove(transcript.partial_path)
+
+if __name__ == "__main__":
+    asyncio.run(main())